@@ -1,19 +1,16 @@
-import os
 from logging.config import fileConfig
 
 from alembic import context
-from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
-# Load environment variables
-load_dotenv()
+from app.config import DATABASE_URL
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Set sqlalchemy.url from environment variable
-config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL", ""))
+config.set_main_option("sqlalchemy.url", DATABASE_URL or "")
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -23,6 +20,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.database import Base
+from app.models.conversation import Conversation, Message  # noqa: F401
 from app.models.user import User  # noqa: F401 - Import models for autogenerate
 
 target_metadata = Base.metadata
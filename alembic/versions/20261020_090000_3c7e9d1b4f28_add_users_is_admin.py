@@ -0,0 +1,29 @@
+"""add users.is_admin
+
+Revision ID: 3c7e9d1b4f28
+Revises: 8d41e6a2c3f5
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9d1b4f28'
+down_revision: Union[str, None] = '8d41e6a2c3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: the column is already there when create_all built the table.
+    op.execute(
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN NOT NULL DEFAULT false"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'is_admin')
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import PlainTextResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred order when a client accepts several encodings.
+ENCODINGS = ("br", "gzip")
+
+
+class Asset:
+    """A static file held in memory with its precompressed variants."""
+
+    def __init__(self, path: Path):
+        stat = path.stat()
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        # Each encoding is a different representation, so each gets its own
+        # strong ETag.
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            "identity": (content, f'"{digest}"')
+        }
+        compressed = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(content, quality=11)
+        for encoding, body in compressed.items():
+            if len(body) < len(content):
+                self.variants[encoding] = (body, f'"{digest}-{encoding}"')
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in header.split(",")
+    )
+
+
+class AssetCache:
+    """Serves files from `directory` with compression and ETag revalidation.
+
+    `load` precompresses every file up front; files changed on disk are
+    picked up again on their next request. Compression is CPU bound, so
+    `response` should be called from a threadpool rather than the event loop.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory.resolve()
+        self._assets: Dict[str, Asset] = {}
+
+    def load(self) -> None:
+        for path in self.directory.rglob("*"):
+            if path.is_file():
+                self._assets[path.relative_to(self.directory).as_posix()] = Asset(path)
+        logger.info(f"Precompressed {len(self._assets)} static assets")
+
+    def get(self, name: str) -> Optional[Asset]:
+        path = (self.directory / name).resolve()
+        if not path.is_relative_to(self.directory) or not path.is_file():
+            return None
+        # Key by the resolved path so other spellings of it share one entry.
+        key = path.relative_to(self.directory).as_posix()
+        asset = self._assets.get(key)
+        stat = path.stat()
+        if asset is None or asset.version != (stat.st_mtime_ns, stat.st_size):
+            asset = self._assets[key] = Asset(path)
+        return asset
+
+    def response(self, request: Request, name: str, cache_control: str) -> Response:
+        asset = self.get(name)
+        if asset is None:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (e for e in ENCODINGS if e in asset.variants and accepted.get(e, 0) > 0),
+            "identity",
+        )
+        body, etag = asset.variants[encoding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        # Set for identity too, so GZipMiddleware leaves the body (and the
+        # ETag that names it) alone.
+        headers["Content-Encoding"] = encoding
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(media_type=asset.media_type, headers=headers)
+        return Response(body, media_type=asset.media_type, headers=headers)
@@ -1,21 +1,17 @@
-import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from app.config import SECRET_KEY
 from app.database import DB
 from app.models.user import User
 from app.schemas.token import TokenData
 
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
@@ -51,6 +47,19 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     return user
 
 
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """Returns the user a token was issued to, or None if it is invalid."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        username: str = payload.get("sub")
+        if username is None:
+            return None
+        token_data = TokenData(username=username)
+    except JWTError:
+        return None
+    return db.query(User).filter(User.username == token_data.username).first()
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(DB.get_db)
 ) -> User:
@@ -59,16 +68,16 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = get_user_from_token(db, token)
     if user is None:
         raise credentials_exception
     return user
 
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
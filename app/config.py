@@ -0,0 +1,50 @@
+import os
+
+from dotenv import load_dotenv
+
+# Load the .env file once; every other module reads its settings from here.
+load_dotenv()
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi3")
+
+# Messages kept as context for each chat connection.
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
+# Messages held in memory across all connections.
+SESSION_STORE_MAX_MESSAGES = int(os.getenv("SESSION_STORE_MAX_MESSAGES", "100000"))
+# Quiet period after which a stored conversation is dropped from memory.
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "300"))
+
+# On SIGTERM, how long in-flight chat generations get to finish.
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("DRAIN_TIMEOUT_SECONDS", "30"))
+# Clients are told to reconnect after RECONNECT_BASE_MS plus up to
+# RECONNECT_JITTER_MS of random delay.
+RECONNECT_BASE_MS = int(os.getenv("RECONNECT_BASE_MS", "1000"))
+RECONNECT_JITTER_MS = int(os.getenv("RECONNECT_JITTER_MS", "10000"))
+
+# Threads used to hash plain-text passwords during bulk imports.
+BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", str(os.cpu_count() or 4)))
+
+# Responses smaller than this many bytes are sent uncompressed.
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1000"))
+# Cache lifetime for /static assets; "/" is always revalidated by ETag.
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "86400"))
+# permessage-deflate for the chat WebSocket when run through `python main.py`.
+WS_PER_MESSAGE_DEFLATE = _get_bool("WS_PER_MESSAGE_DEFLATE", True)
+
+# When false, startup trusts `alembic upgrade head` and skips create_all.
+DB_CREATE_ALL = _get_bool("DB_CREATE_ALL", True)
+
+# Cold start budget checked by `python main.py --profile-startup`.
+STARTUP_BUDGET_MS = int(os.getenv("STARTUP_BUDGET_MS", "1500"))
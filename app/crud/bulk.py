@@ -0,0 +1,219 @@
+import json
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.auth import get_password_hash
+from app.models.conversation import Conversation, Message
+from app.models.user import User
+
+BATCH_SIZE = 1000
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_datetime(value: Optional[str]) -> datetime:
+    return datetime.fromisoformat(value) if value else datetime.now(timezone.utc)
+
+
+def export_records(db: Session, batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    """Streams every user, conversation and message as export records.
+
+    Rows are read through server-side cursors (`yield_per`), so memory use
+    does not grow with the size of the tables.
+    """
+    users = db.query(User).order_by(User.id).yield_per(batch_size)
+    for user in users:
+        yield {
+            "type": "user",
+            "username": user.username,
+            "email": user.email,
+            "password_hash": user.password,
+        }
+
+    conversations = (
+        db.query(Conversation, User.username)
+        .join(User, User.id == Conversation.user_id)
+        .order_by(Conversation.id)
+        .yield_per(batch_size)
+    )
+    for conversation, username in conversations:
+        yield {
+            "type": "conversation",
+            "id": conversation.id,
+            "username": username,
+            "title": conversation.title,
+            "created_at": _isoformat(conversation.created_at),
+        }
+
+    messages = (
+        db.query(Message)
+        .order_by(Message.id)
+        .yield_per(batch_size)
+    )
+    for message in messages:
+        yield {
+            "type": "message",
+            "conversation_id": message.conversation_id,
+            "role": message.role,
+            "content": message.content,
+            "created_at": _isoformat(message.created_at),
+        }
+
+
+def export_ndjson(db: Session, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """Yields NDJSON in chunks of `batch_size` lines."""
+    chunk = []
+    for record in export_records(db, batch_size=batch_size):
+        chunk.append(json.dumps(record) + "\n")
+        if len(chunk) >= batch_size:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+def _insert_users(
+    db: Session,
+    records: List[dict],
+    executor: Optional[Executor],
+    user_ids: Dict[str, int],
+) -> int:
+    # bcrypt releases the GIL, so hashing spreads across a thread pool.
+    passwords = [r["password"] for r in records if "password_hash" not in r]
+    hash_fn = executor.map if executor else map
+    hashes = iter(hash_fn(get_password_hash, passwords))
+
+    rows = [
+        {
+            "username": r["username"],
+            "email": r["email"],
+            "password": r["password_hash"] if "password_hash" in r else next(hashes),
+        }
+        for r in records
+    ]
+    # Users that already exist are skipped, so an import can be resumed.
+    result = db.execute(
+        pg_insert(User).on_conflict_do_nothing().returning(User.username, User.id),
+        rows,
+    ).all()
+    user_ids.update(result)
+    return len(result)
+
+
+def _insert_conversations(
+    db: Session,
+    records: List[dict],
+    user_ids: Dict[str, int],
+    conversation_ids: Dict[int, Tuple[int, int]],
+) -> int:
+    # Only users created by this import get history, so a rerun does not
+    # duplicate conversations or attach them to an unrelated existing account.
+    records = [r for r in records if r["username"] in user_ids]
+    if not records:
+        return 0
+
+    rows = [
+        {
+            "user_id": user_ids[r["username"]],
+            "title": r.get("title"),
+            "created_at": _parse_datetime(r.get("created_at")),
+        }
+        for r in records
+    ]
+    # insertmanyvalues returns rows in input order when sort_by_parameter_order is set.
+    result = db.execute(
+        insert(Conversation)
+        .returning(Conversation.id, Conversation.user_id, sort_by_parameter_order=True),
+        rows,
+    )
+    for record, (new_id, user_id) in zip(records, result.all()):
+        conversation_ids[record["id"]] = (new_id, user_id)
+    return len(rows)
+
+
+def _insert_messages(
+    db: Session, records: List[dict], conversation_ids: Dict[int, Tuple[int, int]]
+) -> int:
+    rows = [
+        {
+            "conversation_id": conversation_ids[r["conversation_id"]][0],
+            "user_id": conversation_ids[r["conversation_id"]][1],
+            "role": r["role"],
+            "content": r["content"],
+            "created_at": _parse_datetime(r.get("created_at")),
+        }
+        for r in records
+        if r["conversation_id"] in conversation_ids
+    ]
+    if rows:
+        db.execute(insert(Message), rows)
+    return len(rows)
+
+
+def import_ndjson(
+    db: Session,
+    lines: Iterable[str],
+    batch_size: int = BATCH_SIZE,
+    executor: Optional[Executor] = None,
+) -> Iterator[Dict[str, int]]:
+    """Imports NDJSON records produced by `export_ndjson`.
+
+    User records may carry either a `password_hash` or a plain `password`,
+    which is hashed on `executor` when one is given. Users that already
+    exist are skipped along with their conversations and messages. Records are inserted
+    with multi-row INSERTs and committed every `batch_size` rows, yielding
+    the running totals after each commit.
+
+    Records are expected in export order: users, then conversations, then
+    messages. The new ids of imported users are dropped once the messages
+    start; a mapping from each imported conversation to its new id is kept
+    until the end, about 200 bytes per conversation.
+    """
+    totals = {"users": 0, "conversations": 0, "messages": 0, "skipped": 0}
+    # Username -> id of the users inserted by this import.
+    user_ids: Dict[str, int] = {}
+    # Exported conversation id -> (new id, user id), so messages can follow.
+    conversation_ids: Dict[int, Tuple[int, int]] = {}
+    batch: List[dict] = []
+    batch_type = None
+
+    def flush():
+        if batch_type == "user":
+            inserted = _insert_users(db, batch, executor, user_ids)
+            totals["users"] += inserted
+        elif batch_type == "conversation":
+            inserted = _insert_conversations(db, batch, user_ids, conversation_ids)
+            totals["conversations"] += inserted
+        else:
+            inserted = _insert_messages(db, batch, conversation_ids)
+            totals["messages"] += inserted
+        totals["skipped"] += len(batch) - inserted
+        db.commit()
+        batch.clear()
+
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode()
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        record_type = record.get("type")
+        if record_type not in ("user", "conversation", "message"):
+            raise ValueError(f"Unknown record type: {record_type!r}")
+        if batch and (record_type != batch_type or len(batch) >= batch_size):
+            flush()
+            yield dict(totals)
+        if record_type == "message":
+            user_ids.clear()  # only conversations need them
+        batch_type = record_type
+        batch.append(record)
+    if batch:
+        flush()
+    yield dict(totals)
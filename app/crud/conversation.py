@@ -0,0 +1,119 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, cast, func, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.conversation import Conversation, Message
+
+SEARCH_CONFIG = "english"
+
+
+def create_conversation(db: Session, user_id: int, title: Optional[str] = None):
+    db_conversation = Conversation(user_id=user_id, title=title)
+    db.add(db_conversation)
+    db.commit()
+    db.refresh(db_conversation)
+    return db_conversation
+
+
+def get_conversation(db: Session, conversation_id: int, user_id: int):
+    return (
+        db.query(Conversation)
+        .filter(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        .first()
+    )
+
+
+def create_message(
+    db: Session, conversation_id: int, user_id: int, role: str, content: str
+):
+    db_message = Message(
+        conversation_id=conversation_id, user_id=user_id, role=role, content=content
+    )
+    db.add(db_message)
+    db.commit()
+    db.refresh(db_message)
+    return db_message
+
+
+def add_message(db: Session, conversation: Conversation, role: str, content: str):
+    return create_message(db, conversation.id, conversation.user_id, role, content)
+
+
+def get_recent_messages(db: Session, conversation_id: int, limit: int):
+    """Returns the last `limit` (role, content) pairs of a conversation, oldest first."""
+    rows = (
+        db.query(Message.role, Message.content)
+        .filter(Message.conversation_id == conversation_id)
+        .order_by(Message.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [(role, content) for role, content in reversed(rows)]
+
+
+def encode_cursor(key, message_id: int) -> str:
+    """Packs the sort key of the last row on a page into an opaque cursor."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([key, message_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, order: str) -> Tuple[object, int]:
+    """Raises ValueError if the cursor was not produced by `encode_cursor`."""
+    try:
+        key, message_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if order == "recent":
+            key = datetime.fromisoformat(key)
+        else:
+            key = float(key)
+        return key, int(message_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def search_messages(
+    db: Session,
+    user_id: int,
+    query: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    order: str = "rank",
+) -> Tuple[List[tuple], Optional[str]]:
+    """Full-text search over a user's messages, paginated with keyset cursors.
+
+    Returns (rows of (Message, rank), next_cursor). Ordering by "rank" sorts
+    by relevance; "recent" walks the (user_id, created_at) index newest first.
+    """
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    # ts_rank_cd returns real; widen it so the rank in a cursor round-trips
+    # exactly through a Python float.
+    rank = cast(func.ts_rank_cd(Message.search_vector, ts_query), Float)
+
+    q = db.query(Message, rank.label("rank")).filter(
+        Message.user_id == user_id,
+        Message.search_vector.bool_op("@@")(ts_query),
+    )
+
+    if order == "recent":
+        sort_key = Message.created_at
+    else:
+        sort_key = rank
+
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, order)
+        q = q.filter(tuple_(sort_key, Message.id) < tuple_(last_key, last_id))
+
+    rows = q.order_by(sort_key.desc(), Message.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        message, message_rank = rows[-1]
+        last_key = message.created_at if order == "recent" else message_rank
+        next_cursor = encode_cursor(last_key, message.id)
+    return rows, next_cursor
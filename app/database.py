@@ -1,11 +1,9 @@
 import logging
-import os
 
-from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-load_dotenv()
+from app.config import DATABASE_URL, DB_CREATE_ALL
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,11 +12,26 @@ Base = declarative_base()
 
 
 class Database:
-    def __init__(self, DATABASE_URL):
-        self.engine = create_engine(DATABASE_URL)
-        self.SessionLocal = sessionmaker(
-            autoflush=False, autocommit=False, bind=self.engine
-        )
+    def __init__(self, DATABASE_URL, create_all: bool = True):
+        self.url = DATABASE_URL
+        self.create_all = create_all
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self):
+        """Creates the engine on first use so importing the app stays cheap."""
+        if self._engine is None:
+            self._engine = create_engine(self.url)
+        return self._engine
+
+    @property
+    def SessionLocal(self):
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(
+                autoflush=False, autocommit=False, bind=self.engine
+            )
+        return self._session_factory
 
     def get_db(self):
         """Dependency Injection: Yields a new session and ensures proper closure."""
@@ -29,7 +42,14 @@ class Database:
             db.close()
 
     def connect(self):
-        """Creates database tables if they don't exist and handles connection."""
+        """Creates database tables if they don't exist and handles connection.
+
+        With ``create_all`` disabled the schema is assumed to be managed by
+        Alembic and the engine is left to connect on the first request.
+        """
+        if not self.create_all:
+            logger.info("Skipping create_all, schema is managed by Alembic")
+            return
         try:
             Base.metadata.create_all(bind=self.engine)
             logger.info("Database connected")
@@ -38,13 +58,14 @@ class Database:
 
     def disconnect(self):
         """Properly disposes of the engine to release resources."""
+        if self._engine is None:
+            return
         try:
-            self.engine.dispose()
+            self._engine.dispose()
             logger.info("Database disconnected")
         except Exception as e:
             logger.error(f"Database disconnection failed: {e}")
 
 
 # Initialize database instance
-DB_URL = os.getenv("DATABASE_URL")
-DB = Database(DB_URL)
+DB = Database(DATABASE_URL, create_all=DB_CREATE_ALL)
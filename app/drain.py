@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import random
+import signal
+import threading
+from typing import Awaitable, Callable, Dict, Set
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from app.config import RECONNECT_BASE_MS, RECONNECT_JITTER_MS
+from app.sessions import ChatSession
+
+logger = logging.getLogger(__name__)
+
+# "Service Restart": the client should reconnect, possibly to another server.
+SERVICE_RESTART = 1012
+
+
+class ConnectionDrain:
+    """Lets open chat sockets wind down before the process exits.
+
+    Once draining, new sockets and idle sockets are told to reconnect right
+    away; sockets waiting on a generation get their reply first, up to the
+    deadline. Each client gets a jittered delay so they don't all reconnect
+    at once.
+    """
+
+    def __init__(
+        self,
+        base_ms: int = RECONNECT_BASE_MS,
+        jitter_ms: int = RECONNECT_JITTER_MS,
+    ):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.draining = False
+        self.generating: Set[WebSocket] = set()
+
+    def reconnect_frame(self, session: ChatSession) -> dict:
+        return {
+            "type": "reconnect",
+            "retry_after_ms": self.base_ms + int(random.random() * self.jitter_ms),
+            "conversation_id": session.conversation_id,
+        }
+
+    async def send_reconnect(self, websocket: WebSocket, session: ChatSession) -> None:
+        if websocket.application_state != WebSocketState.CONNECTED:
+            return
+        try:
+            await websocket.send_text(json.dumps(self.reconnect_frame(session)))
+            await websocket.close(code=SERVICE_RESTART)
+        except Exception as e:
+            logger.warning(f"Could not send reconnect frame: {e}")
+
+    async def drain(self, clients: Dict[WebSocket, ChatSession], timeout: float) -> None:
+        self.draining = True
+        logger.info(f"Draining {len(clients)} chat connections")
+        # Sent concurrently so one slow client doesn't hold up the rest.
+        await asyncio.gather(
+            *(
+                self.send_reconnect(websocket, session)
+                for websocket, session in list(clients.items())
+                if websocket not in self.generating
+            )
+        )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.generating and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        if self.generating:
+            logger.warning(
+                f"Drain deadline passed with {len(self.generating)} generations in flight"
+            )
+
+        # Whatever is left missed the deadline and is cut off.
+        await asyncio.gather(
+            *(
+                self.send_reconnect(websocket, session)
+                for websocket, session in list(clients.items())
+            )
+        )
+        logger.info("Chat connections drained")
+
+
+def install_sigterm_drain(drain: Callable[[], Awaitable[None]]) -> None:
+    """Runs `drain` on SIGTERM, then hands the signal to the previous handler.
+
+    Uvicorn closes every WebSocket as soon as it starts shutting down, so
+    draining has to happen before its own SIGTERM handler runs. A second
+    SIGTERM skips the drain.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return  # signal handlers can only be set from the main thread
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def forward():
+        signal.signal(signal.SIGTERM, previous)
+        signal.raise_signal(signal.SIGTERM)
+
+    async def drain_then_forward():
+        try:
+            await drain()
+        finally:
+            forward()
+
+    def handle_sigterm(signum, frame):
+        signal.signal(signal.SIGTERM, lambda *_: loop.call_soon_threadsafe(forward))
+        loop.call_soon_threadsafe(lambda: loop.create_task(drain_then_forward()))
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+connection_drain = ConnectionDrain()
@@ -1 +1,2 @@
+from .conversation import Conversation, Message
 from .user import User
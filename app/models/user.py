@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Boolean, Column, Integer, String, false
 
 from app.database import Base
 
@@ -10,3 +10,5 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     password = Column(String, nullable=False)
+    # Granted with scripts/admin.py; never set by registration or imports.
+    is_admin = Column(Boolean, nullable=False, default=False, server_default=false())
@@ -0,0 +1,76 @@
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import APIRouter, Depends, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.auth import get_current_admin
+from app.config import BULK_HASH_WORKERS
+from app.crud.bulk import BATCH_SIZE, export_ndjson, import_ndjson
+from app.database import DB
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+
+@router.get("/bulk/export")
+def export_data(
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=10000),
+    current_user: UserModel = Depends(get_current_admin),
+):
+    """Admin endpoint - streams all users and conversations as NDJSON."""
+
+    # The session lives as long as the response body, not the request.
+    def stream():
+        db = DB.SessionLocal()
+        try:
+            yield from export_ndjson(db, batch_size=batch_size)
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/bulk/import")
+def import_data(
+    file: UploadFile,
+    batch_size: int = Query(BATCH_SIZE, ge=1, le=10000),
+    current_user: UserModel = Depends(get_current_admin),
+):
+    """Admin endpoint - imports an NDJSON export, streaming progress as NDJSON."""
+    # The upload is closed once this function returns, before the response
+    # body runs, so hand the generator its own on-disk copy.
+    source = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.file, source)
+    source.seek(0)
+
+    def stream():
+        db = DB.SessionLocal()
+        try:
+            with ThreadPoolExecutor(max_workers=BULK_HASH_WORKERS) as executor:
+                for totals in import_ndjson(
+                    db, source, batch_size=batch_size, executor=executor
+                ):
+                    yield json.dumps(totals) + "\n"
+        except (KeyError, ValueError) as e:
+            db.rollback()
+            yield json.dumps({"error": f"Invalid record: {e}"}) + "\n"
+        except SQLAlchemyError as e:
+            # Earlier batches stay committed; report where the import stopped.
+            db.rollback()
+            reason = str(getattr(e, "orig", None) or e).splitlines()[0]
+            yield json.dumps({"error": f"Database error: {reason}"}) + "\n"
+        finally:
+            db.close()
+            source.close()
+
+    # Marked as already encoded so the GZip middleware doesn't hold progress
+    # lines back in its compression buffer.
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"},
+    )
@@ -1,28 +1,107 @@
 import json
-from typing import Dict, List
+from typing import Dict, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-
+from starlette.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketState
+
+from app.auth import get_user_from_token
+from app.crud.conversation import (
+    create_conversation,
+    create_message,
+    get_conversation,
+    get_recent_messages,
+)
+from app.database import DB
+from app.drain import connection_drain
 from app.services.ollama import ollama_service
+from app.sessions import ASSISTANT, USER, ChatSession, session_manager
 
 router = APIRouter()
 
-# Store connected clients and their conversation history
-connected_clients: Dict[WebSocket, List[dict]] = {}
+# Store connected clients and their chat session
+connected_clients: Dict[WebSocket, ChatSession] = {}
 
 SYSTEM_PROMPT = """You are a helpful, friendly AI assistant. Keep your responses concise and conversational. 
 If you don't know something, say so honestly. Be helpful but don't be overly verbose."""
 
 
+def _authenticate(token: str) -> Optional[int]:
+    db = DB.SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+        return user.id if user else None
+    finally:
+        db.close()
+
+
+def _owns_conversation(user_id: int, conversation_id: int) -> bool:
+    db = DB.SessionLocal()
+    try:
+        return get_conversation(db, conversation_id, user_id) is not None
+    finally:
+        db.close()
+
+
+def _start_conversation(user_id: int, title: str) -> int:
+    db = DB.SessionLocal()
+    try:
+        return create_conversation(db, user_id, title=title[:80]).id
+    finally:
+        db.close()
+
+
+def _save_message(session: ChatSession, role: str, content: str) -> None:
+    db = DB.SessionLocal()
+    try:
+        create_message(db, session.conversation_id, session.user_id, role, content)
+    finally:
+        db.close()
+
+
+def _load_history(conversation_id: int, limit: int):
+    db = DB.SessionLocal()
+    try:
+        return get_recent_messages(db, conversation_id, limit)
+    finally:
+        db.close()
+
+
+async def _join(session: ChatSession, message_data: dict) -> None:
+    """Signs the session in from the `token` in a join frame.
+
+    The token travels in the frame rather than the URL so it stays out of
+    access logs. Signed-in users get their conversation stored; anonymous
+    chats stay in memory.
+    """
+    token = message_data.get("token")
+    if session.user_id is not None or not token:
+        return
+    session.user_id = await run_in_threadpool(_authenticate, token)
+
+    # A reconnecting client resumes its conversation; history loads on the next message.
+    conversation_id = message_data.get("conversation_id")
+    if session.user_id is not None and isinstance(conversation_id, int):
+        if await run_in_threadpool(_owns_conversation, session.user_id, conversation_id):
+            session_manager.release(session)
+            session.conversation_id = conversation_id
+
+
 @router.websocket("/chat")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    connected_clients[websocket] = []
+    session = ChatSession()
+
+    if connection_drain.draining:
+        await connection_drain.send_reconnect(websocket, session)
+        return
+    connected_clients[websocket] = session
 
     # Send welcome message
     welcome = {
         "type": "system",
         "text": "Connected to AI Chat! Send a message to start chatting.",
+        "conversation_id": session.conversation_id,
     }
     await websocket.send_text(json.dumps(welcome))
 
@@ -36,45 +115,94 @@ async def websocket_endpoint(websocket: WebSocket):
                 user_message = message_data.get("text", data)
                 username = message_data.get("username", "User")
             except json.JSONDecodeError:
+                message_data = {}
                 user_message = data
                 username = "User"
 
-            # Skip empty messages or join messages
-            if not user_message or message_data.get("type") == "join":
+            if message_data.get("type") == "join":
+                await _join(session, message_data)
                 continue
 
-            # Add user message to history
-            connected_clients[websocket].append(
-                {"role": "user", "content": user_message}
-            )
-
-            # Keep only last 10 messages for context
-            if len(connected_clients[websocket]) > 20:
-                connected_clients[websocket] = connected_clients[websocket][-20:]
-
-            # Get AI response
-            ai_response = await ollama_service.chat(
-                message=user_message,
-                system_prompt=SYSTEM_PROMPT,
-                conversation_history=connected_clients[websocket][:-1],  # Exclude current message
-            )
-
-            # Add AI response to history
-            connected_clients[websocket].append(
-                {"role": "assistant", "content": ai_response}
-            )
-
-            # Send AI response back to the user
-            response = {
-                "type": "message",
-                "text": ai_response,
-                "username": "AI Assistant",
-                "isAI": True,
-            }
-            await websocket.send_text(json.dumps(response))
+            # Skip empty messages
+            if not user_message:
+                continue
+
+            if connection_drain.draining:
+                await connection_drain.send_reconnect(websocket, session)
+                break
+
+            # The socket stays in `generating` until the reply is delivered, so
+            # the drain waits for it instead of closing it underneath us.
+            connection_drain.generating.add(websocket)
+            session.generating = True
+            try:
+                ai_response = await _generate_reply(session, user_message)
+
+                # The drain deadline may have closed the socket mid-generation;
+                # the reply was never seen, so it is not kept in the conversation.
+                if websocket.application_state != WebSocketState.CONNECTED:
+                    break
+
+                # Send AI response back to the user
+                response = {
+                    "type": "message",
+                    "text": ai_response,
+                    "username": "AI Assistant",
+                    "isAI": True,
+                    "conversation_id": session.conversation_id,
+                }
+                await websocket.send_text(json.dumps(response))
+                await _record_reply(session, ai_response)
+
+                if connection_drain.draining:
+                    await connection_drain.send_reconnect(websocket, session)
+                    break
+            finally:
+                connection_drain.generating.discard(websocket)
+                session.generating = False
 
     except WebSocketDisconnect:
+        pass
+    finally:
         connected_clients.pop(websocket, None)
+        session_manager.release(session)
+
+
+async def _generate_reply(session: ChatSession, user_message: str) -> str:
+    if session.user_id is not None and not session.persistent:
+        session.conversation_id = await run_in_threadpool(
+            _start_conversation, session.user_id, user_message
+        )
+
+    # Earlier messages, reloaded from the database if the session was idle
+    history = session_manager.history(session)
+    if history is None:
+        stored = await run_in_threadpool(
+            _load_history, session.conversation_id, session_manager.history_limit
+        )
+        session_manager.restore(session, stored)
+        history = session_manager.history(session) or []
+
+    # Add user message to history
+    session_manager.append(session, USER, user_message)
+    if session.persistent:
+        await run_in_threadpool(_save_message, session, USER, user_message)
+
+    # Get AI response
+    ai_response = await ollama_service.chat(
+        message=user_message,
+        system_prompt=SYSTEM_PROMPT,
+        conversation_history=history,
+    )
+
+    return ai_response
+
+
+async def _record_reply(session: ChatSession, ai_response: str) -> None:
+    # Add AI response to history
+    session_manager.append(session, ASSISTANT, ai_response)
+    if session.persistent:
+        await run_in_threadpool(_save_message, session, ASSISTANT, ai_response)
 
 
 @router.get("/chat/status")
@@ -87,4 +215,6 @@ async def chat_status():
         "current_model": ollama_service.model,
         "available_models": models,
         "connected_clients": len(connected_clients),
+        "stored_messages": len(session_manager.store),
+        "draining": connection_drain.draining,
     }
@@ -0,0 +1,42 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_user
+from app.crud.conversation import search_messages
+from app.database import DB
+from app.models.user import User as UserModel
+from app.schemas.search import SearchPage, SearchResult
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=SearchPage)
+def search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["rank", "recent"] = "rank",
+    db: Session = Depends(DB.get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Protected endpoint - searches the current user's chat history."""
+    try:
+        rows, next_cursor = search_messages(
+            db, current_user.id, q, limit=limit, cursor=cursor, order=order
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = [
+        SearchResult(
+            id=message.id,
+            conversation_id=message.conversation_id,
+            role=message.role,
+            content=message.content,
+            created_at=message.created_at,
+            rank=rank,
+        )
+        for message, rank in rows
+    ]
+    return SearchPage(results=results, next_cursor=next_cursor)
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    id: int
+    conversation_id: int
+    role: str
+    content: str
+    created_at: datetime
+    rank: float
+
+
+class SearchPage(BaseModel):
+    results: List[SearchResult]
+    next_cursor: Optional[str] = None
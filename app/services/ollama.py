@@ -1,20 +1,23 @@
-import os
+import json
 from typing import AsyncGenerator, Optional
 
 import httpx
-from dotenv import load_dotenv
 
-load_dotenv()
-
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi3")
+from app.config import OLLAMA_BASE_URL, OLLAMA_MODEL
 
 
 class OllamaService:
     def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_MODEL):
         self.base_url = base_url
         self.model = model
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Creates the HTTP client on first use rather than at import time."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=60.0)
+        return self._client
 
     async def chat(
         self,
@@ -82,7 +85,6 @@ class OllamaService:
                 response.raise_for_status()
                 async for line in response.aiter_lines():
                     if line:
-                        import json
                         data = json.loads(line)
                         content = data.get("message", {}).get("content", "")
                         if content:
@@ -112,7 +114,9 @@ class OllamaService:
 
     async def close(self):
         """Close the HTTP client."""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 # Singleton instance
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from itertools import count
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from app.config import (
+    CHAT_HISTORY_LIMIT,
+    SESSION_IDLE_SECONDS,
+    SESSION_STORE_MAX_MESSAGES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Interned so every history entry shares one string object per role.
+USER = sys.intern("user")
+ASSISTANT = sys.intern("assistant")
+
+
+class MessageStore:
+    """Message text shared by all sessions, bounded to `max_messages`.
+
+    Sessions only hold integer keys into the store. The least recently used
+    entries are dropped once the store is full; sessions backed by a stored
+    conversation reload them from the database.
+    """
+
+    def __init__(self, max_messages: int = SESSION_STORE_MAX_MESSAGES):
+        self.max_messages = max_messages
+        self._messages: "OrderedDict[int, Tuple[str, str]]" = OrderedDict()
+        self._keys = count()
+        self._peak = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def add(self, role: str, content: str) -> int:
+        key = next(self._keys)
+        self._messages[key] = (sys.intern(role), content)
+        if len(self._messages) > self.max_messages:
+            self._messages.popitem(last=False)
+        self._peak = max(self._peak, len(self._messages))
+        return key
+
+    def get(self, key: int) -> Optional[Tuple[str, str]]:
+        message = self._messages.get(key)
+        if message is not None:
+            self._messages.move_to_end(key)
+        return message
+
+    def discard(self, keys: Iterable[int]) -> None:
+        for key in keys:
+            self._messages.pop(key, None)
+        # Dicts never shrink on delete; rebuild once most entries are gone so
+        # a wave of evictions actually returns memory.
+        if len(self._messages) < self._peak // 4:
+            self._messages = OrderedDict(self._messages)
+            self._peak = len(self._messages)
+
+
+class ChatSession:
+    """Per-connection chat state.
+
+    `history` is None once the session has been evicted; it is rebuilt from
+    the conversation on the next message. Sessions are not evicted while
+    `generating` a reply.
+    """
+
+    __slots__ = ("user_id", "conversation_id", "history", "last_active", "generating")
+
+    def __init__(self, user_id: Optional[int] = None):
+        self.user_id = user_id
+        self.conversation_id: Optional[int] = None
+        self.history: Optional[array] = array("q")
+        self.last_active = time.monotonic()
+        self.generating = False
+
+    @property
+    def persistent(self) -> bool:
+        return self.conversation_id is not None
+
+
+class SessionManager:
+    def __init__(
+        self,
+        store: Optional[MessageStore] = None,
+        history_limit: int = CHAT_HISTORY_LIMIT,
+        idle_seconds: float = SESSION_IDLE_SECONDS,
+    ):
+        self.store = store if store is not None else MessageStore()
+        self.history_limit = history_limit
+        self.idle_seconds = idle_seconds
+
+    def append(self, session: ChatSession, role: str, content: str) -> None:
+        session.last_active = time.monotonic()
+        if session.history is None:
+            if session.persistent:
+                return  # evicted; stays marked for a reload from the database
+            session.history = array("q")
+        session.history.append(self.store.add(role, content))
+        overflow = len(session.history) - self.history_limit
+        if overflow > 0:
+            self.store.discard(session.history[:overflow])
+            del session.history[:overflow]
+
+    def history(self, session: ChatSession) -> Optional[List[dict]]:
+        """Returns the session history as Ollama chat messages.
+
+        Returns None when a stored conversation has been evicted, or the store
+        has dropped some of its entries, and must be reloaded with `restore`.
+        """
+        session.last_active = time.monotonic()
+        messages = []
+        for key in session.history or ():
+            message = self.store.get(key)
+            if message is None:
+                if session.persistent:
+                    return None
+                continue
+            messages.append({"role": message[0], "content": message[1]})
+        if session.history is None and session.persistent:
+            return None
+        return messages
+
+    def restore(self, session: ChatSession, messages: Iterable[Tuple[str, str]]) -> None:
+        """Replaces the session history with (role, content) pairs from storage."""
+        self.release(session)
+        session.history = array("q")
+        for role, content in messages:
+            self.append(session, role, content)
+
+    def release(self, session: ChatSession) -> None:
+        """Drops the session's messages from memory."""
+        if session.history is not None:
+            self.store.discard(session.history)
+        session.history = None
+
+    def evict_idle(self, sessions: Iterable[ChatSession], now: Optional[float] = None) -> int:
+        """Releases stored conversations that have been quiet for `idle_seconds`."""
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        for session in sessions:
+            if (
+                session.persistent
+                and not session.generating
+                and session.history is not None
+                and now - session.last_active >= self.idle_seconds
+            ):
+                self.release(session)
+                evicted += 1
+        return evicted
+
+
+async def evict_idle_sessions(
+    manager: SessionManager, sessions: Callable[[], Iterable[ChatSession]]
+) -> None:
+    """Background task that periodically evicts idle sessions."""
+    interval = max(manager.idle_seconds / 2, 1)
+    while True:
+        await asyncio.sleep(interval)
+        evicted = manager.evict_idle(list(sessions()))
+        if evicted:
+            logger.info(f"Evicted history of {evicted} idle chat sessions")
+
+
+session_manager = SessionManager()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Matches one line of `python -X importtime` output:
+# "import time:       self [us] |  cumulative | imported package"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+# Milliseconds spent in each lifespan startup step, filled in by `timed`.
+init_timings: Dict[str, float] = {}
+
+
+@contextmanager
+def timed(step: str):
+    """Records how long a startup step takes in `init_timings`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        init_timings[step] = (time.perf_counter() - start) * 1000
+        logger.info(f"Startup step '{step}' took {init_timings[step]:.1f} ms")
+
+
+def profile_imports(module: str = "main") -> List[Tuple[str, float, int]]:
+    """Imports `module` in a fresh interpreter and returns its import tree.
+
+    Each row is (module name, cumulative ms, depth below `module`), with
+    `module` itself as the last row at depth 0.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            rows.append((name, int(cumulative) / 1000, (len(indent) - 1) // 2))
+
+    # importtime prints children before their parent, so the subtree of
+    # `module` is everything after the previous top-level import.
+    end = max(i for i, (name, _, depth) in enumerate(rows) if name == module and depth == 0)
+    start = max((i for i, (_, _, depth) in enumerate(rows[:end]) if depth == 0), default=-1)
+    return rows[start + 1 : end + 1]
+
+
+async def _run_lifespan(app, lifespan):
+    async with lifespan(app):
+        pass
+
+
+def profile_startup(app, lifespan, budget_ms: int, module: str = "main") -> int:
+    """Prints import and init time per module; returns 1 if over budget."""
+    rows = profile_imports(module)
+    import_ms = rows[-1][1]
+    shown: Dict[str, float] = {}
+    for name, ms, depth in rows:
+        if depth == 1 or name == module or name.startswith("app."):
+            shown[name] = max(ms, shown.get(name, 0.0))
+
+    print("Import time (cumulative)")
+    for name, ms in sorted(shown.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {ms:9.1f} ms  {name}")
+
+    init_timings.clear()
+    asyncio.run(_run_lifespan(app, lifespan))
+    init_ms = sum(init_timings.values())
+
+    print("Init time")
+    for step, ms in init_timings.items():
+        print(f"  {ms:9.1f} ms  {step}")
+
+    total_ms = import_ms + init_ms
+    print(f"Total cold start: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    if total_ms > budget_ms:
+        print("Startup is over budget")
+        return 1
+    return 0
@@ -1,28 +1,52 @@
+import asyncio
+import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
+from app.assets import AssetCache
+from app.config import (
+    DRAIN_TIMEOUT_SECONDS,
+    GZIP_MIN_SIZE,
+    STARTUP_BUDGET_MS,
+    STATIC_MAX_AGE,
+    WS_PER_MESSAGE_DEFLATE,
+)
 from app.database import DB
+from app.drain import connection_drain, install_sigterm_drain
 from app.routers.auth import router as auth_router
-from app.routers.chat import router as chat_router
+from app.routers.bulk import router as bulk_router
+from app.routers.chat import connected_clients, router as chat_router
+from app.routers.search import router as search_router
 from app.routers.user import router as user_router
-
-load_dotenv()
+from app.services.ollama import ollama_service
+from app.sessions import evict_idle_sessions, session_manager
+from app.startup import profile_startup, timed
 
 STATIC_DIR = Path(__file__).parent / "static"
+static_assets = AssetCache(STATIC_DIR)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    DB.connect()
+    with timed("database"):
+        DB.connect()
+    with timed("static assets"):
+        static_assets.load()
+    sweeper = asyncio.create_task(
+        evict_idle_sessions(session_manager, connected_clients.values)
+    )
+    install_sigterm_drain(
+        lambda: connection_drain.drain(connected_clients, DRAIN_TIMEOUT_SECONDS)
+    )
     yield
+    sweeper.cancel()
     DB.disconnect()
+    await ollama_service.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -35,14 +59,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+# Precompressed static assets set Content-Encoding and are passed through as-is.
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 app.include_router(auth_router, prefix="/api/auth")
 app.include_router(user_router, prefix="/api")
 app.include_router(chat_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
+app.include_router(bulk_router, prefix="/api")
+
+
+# Serve static files. Sync handlers run in the threadpool, so compressing a
+# changed file never blocks the event loop.
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def read_static(path: str, request: Request):
+    return static_assets.response(
+        request, path, cache_control=f"public, max-age={STATIC_MAX_AGE}"
+    )
+
+
+@app.api_route("/", methods=["GET", "HEAD"])
+def read_root(request: Request):
+    return static_assets.response(request, "index.html", cache_control="no-cache")
+
+
+if __name__ == "__main__":
+    import argparse
 
-# Serve static files
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+    import uvicorn
 
+    parser = argparse.ArgumentParser(description="Run the AI Chatbot server.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and init time per module instead of serving.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=int,
+        default=STARTUP_BUDGET_MS,
+        help="Cold start budget for --profile-startup (default: %(default)s).",
+    )
+    args = parser.parse_args()
 
-@app.get("/")
-async def read_root():
-    return FileResponse(STATIC_DIR / "index.html")
+    if args.profile_startup:
+        sys.exit(profile_startup(app, lifespan, budget_ms=args.budget_ms))
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+    )
@@ -0,0 +1,36 @@
+"""Grant or revoke admin rights, which unlock the bulk export/import API.
+
+    python scripts/admin.py grant alice
+    python scripts/admin.py revoke alice
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import DB  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=("grant", "revoke"))
+    parser.add_argument("username")
+    args = parser.parse_args()
+
+    db = DB.SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == args.username).first()
+        if user is None:
+            sys.exit(f"No user named {args.username!r}")
+        user.is_admin = args.action == "grant"
+        db.commit()
+        print(f"{args.username}: is_admin={user.is_admin}")
+    finally:
+        db.close()
+        DB.disconnect()
+
+
+if __name__ == "__main__":
+    main()
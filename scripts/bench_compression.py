@@ -0,0 +1,100 @@
+"""Compare bytes on the wire with and without response compression.
+
+Requests the chat page and the OpenAPI schema (a large JSON response)
+through the app with different Accept-Encoding headers, plus an ETag
+revalidation, and estimates permessage-deflate savings for chat WebSocket
+frames by compressing sample frames the way the extension does.
+
+    python scripts/bench_compression.py
+"""
+import json
+import sys
+import zlib
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import app  # noqa: E402
+
+SAMPLE_REPLIES = [
+    "Sure! Here's a quick overview of how Python list comprehensions work.",
+    "A list comprehension builds a new list from an iterable in one expression:\n"
+    "```python\nsquares = [x * x for x in range(10)]\n```",
+    "You can add a condition to filter items:\n"
+    "```python\nevens = [x for x in range(10) if x % 2 == 0]\n```",
+    "They are usually faster than an equivalent for loop with append, "
+    "because the loop runs in C rather than in Python bytecode.",
+    "Let me know if you'd like examples with dictionaries or sets as well!",
+]
+
+
+def body_bytes(response) -> int:
+    # httpx decodes the body, so use the encoded length the server sent.
+    if response.status_code == 304:
+        return 0
+    return int(response.headers["content-length"])
+
+
+def wire_bytes(response) -> int:
+    headers = sum(len(k) + len(v) + 4 for k, v in response.headers.raw)
+    return headers + body_bytes(response)
+
+
+def bench_http(client: TestClient) -> None:
+    print(f"{'request':42s} {'status':>6s} {'body':>9s} {'on wire':>9s}")
+    for path in ("/", "/openapi.json"):
+        for encoding in ("identity", "gzip", "br"):
+            response = client.get(path, headers={"Accept-Encoding": encoding})
+            label = f"GET {path} ({encoding})"
+            print(
+                f"{label:42s} {response.status_code:6d} "
+                f"{body_bytes(response):9d} {wire_bytes(response):9d}"
+            )
+
+    etag = client.get("/", headers={"Accept-Encoding": "br"}).headers["etag"]
+    response = client.get("/", headers={"Accept-Encoding": "br", "If-None-Match": etag})
+    label = "GET / revalidated (If-None-Match)"
+    print(
+        f"{label:42s} {response.status_code:6d} "
+        f"{body_bytes(response):9d} {wire_bytes(response):9d}"
+    )
+
+
+def deflate_frames(frames, context_takeover: bool) -> int:
+    total = 0
+    compressor = zlib.compressobj(wbits=-15)
+    for frame in frames:
+        if not context_takeover:
+            compressor = zlib.compressobj(wbits=-15)
+        data = compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        # permessage-deflate drops the trailing 00 00 ff ff of each message.
+        total += len(data) - 4
+    return total
+
+
+def bench_websocket() -> None:
+    frames = [
+        json.dumps(
+            {"type": "message", "text": text, "username": "AI Assistant", "isAI": True}
+        ).encode()
+        for text in SAMPLE_REPLIES * 4
+    ]
+    raw = sum(len(frame) for frame in frames)
+    print()
+    print(f"{len(frames)} chat frames (payload bytes)")
+    print(f"  {'uncompressed':38s} {raw:9d}")
+    print(f"  {'permessage-deflate, no context takeover':38s} {deflate_frames(frames, False):9d}")
+    print(f"  {'permessage-deflate, context takeover':38s} {deflate_frames(frames, True):9d}")
+
+
+def main() -> None:
+    # No lifespan: static assets load on first request and no database is needed.
+    client = TestClient(app)
+    bench_http(client)
+    bench_websocket()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Benchmark chat history search over a synthetic corpus.
+
+Loads a synthetic corpus (one million messages by default) into the database
+pointed to by DATABASE_URL, then times ranked and recent searches for the
+first page and for deep pages reached with keyset cursors, next to the
+equivalent OFFSET query.
+
+    python scripts/bench_search.py --messages 1000000 --users 1000
+
+The synthetic users, conversations and messages are removed afterwards
+unless --keep is given.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import func, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.crud.conversation import search_messages  # noqa: E402
+from app.database import DB, Base  # noqa: E402
+from app.models import Message, User  # noqa: E402
+
+BENCH_PREFIX = "bench_search_"
+
+WORDS = (
+    "python postgres index query bread recipe oven travel flight hotel budget "
+    "invoice deploy docker kubernetes cache latency memory garden tomato "
+    "weather running marathon guitar chord poem history rome empire physics "
+    "quantum energy battery solar contract lawyer tax refund coffee espresso "
+    "vector search ranking cursor keyset offset websocket stream token model"
+).split()
+
+
+def seed(db, n_users: int, n_messages: int, per_conversation: int) -> None:
+    n_conversations = max(1, n_messages // per_conversation)
+    db.execute(
+        text(
+            "INSERT INTO users (username, email, password) "
+            "SELECT :prefix || g, :prefix || g || '@example.com', 'x' "
+            "FROM generate_series(1, :n) AS g"
+        ),
+        {"prefix": BENCH_PREFIX, "n": n_users},
+    )
+    db.execute(
+        text(
+            "INSERT INTO conversations (user_id, title) "
+            "SELECT u.id, 'bench' FROM generate_series(1, :n) AS g "
+            "JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM users "
+            "      WHERE username LIKE :prefix || '%') u ON u.n = g % :users"
+        ),
+        {"prefix": BENCH_PREFIX, "n": n_conversations, "users": n_users},
+    )
+    db.execute(
+        text(
+            "INSERT INTO messages (conversation_id, user_id, role, content, created_at) "
+            "SELECT c.id, c.user_id, "
+            "       CASE WHEN g % 2 = 0 THEN 'user' ELSE 'assistant' END, "
+            "       array_to_string(ARRAY(SELECT w[1 + floor(random() * array_length(w, 1))::int] "
+            "                             FROM generate_series(1, 8 + g % 24)), ' '), "
+            "       now() - make_interval(secs => g) "
+            "FROM generate_series(1, :n) AS g "
+            "JOIN (SELECT id, user_id, row_number() OVER (ORDER BY id) - 1 AS n "
+            "      FROM conversations WHERE title = 'bench') c ON c.n = g % :conversations "
+            "CROSS JOIN (SELECT CAST(:words AS text[]) AS w) words"
+        ),
+        {"n": n_messages, "conversations": n_conversations, "words": list(WORDS)},
+    )
+    db.commit()
+    db.execute(text("ANALYZE users, conversations, messages"))
+
+
+def cleanup(db) -> None:
+    db.rollback()
+    db.query(User).filter(User.username.like(f"{BENCH_PREFIX}%")).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def offset_page(db, user_id: int, query: str, limit: int, offset: int):
+    return (
+        db.query(Message)
+        .filter(
+            Message.user_id == user_id,
+            Message.search_vector.bool_op("@@")(
+                func.websearch_to_tsquery("english", query)
+            ),
+        )
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+
+def bench(db, user_ids, queries, limit: int, pages: int) -> None:
+    results = {"rank first page": [], "recent first page": []}
+    keyset_key = f"recent page {pages} (keyset)"
+    offset_key = f"recent page {pages} (OFFSET)"
+    results[keyset_key] = []
+    results[offset_key] = []
+
+    for user_id in user_ids:
+        query = random.choice(queries)
+        results["rank first page"].append(
+            timed_ms(lambda: search_messages(db, user_id, query, limit=limit))
+        )
+        results["recent first page"].append(
+            timed_ms(
+                lambda: search_messages(db, user_id, query, limit=limit, order="recent")
+            )
+        )
+
+        cursor = None
+        for _ in range(pages - 1):
+            _, cursor = search_messages(
+                db, user_id, query, limit=limit, cursor=cursor, order="recent"
+            )
+            if cursor is None:
+                break
+        if cursor is None:
+            continue
+        results[keyset_key].append(
+            timed_ms(
+                lambda: search_messages(
+                    db, user_id, query, limit=limit, cursor=cursor, order="recent"
+                )
+            )
+        )
+        results[offset_key].append(
+            timed_ms(lambda: offset_page(db, user_id, query, limit, (pages - 1) * limit))
+        )
+
+    for name, samples in results.items():
+        if not samples:
+            print(f"{name:32s} no user had enough matches")
+            continue
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+        print(
+            f"{name:32s} median {statistics.median(samples):8.2f} ms  "
+            f"p95 {p95:8.2f} ms  (n={len(samples)})"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--per-conversation", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=50, help="Users to query.")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10, help="Page depth to compare.")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic rows.")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=DB.engine)
+    db = DB.SessionLocal()
+    try:
+        cleanup(db)
+        print(f"Seeding {args.messages} messages for {args.users} users...")
+        seed_ms = timed_ms(
+            lambda: seed(db, args.users, args.messages, args.per_conversation)
+        )
+        print(f"Seeded in {seed_ms / 1000:.1f} s")
+
+        user_ids = [
+            user_id
+            for (user_id,) in db.query(User.id)
+            .filter(User.username.like(f"{BENCH_PREFIX}%"))
+            .order_by(User.id)
+            .limit(args.samples)
+        ]
+        queries = ["bread recipe", "postgres index", "solar battery", "coffee", "travel -hotel"]
+        bench(db, user_ids, queries, args.limit, args.pages)
+    finally:
+        if not args.keep:
+            cleanup(db)
+        db.close()
+        DB.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark memory per idle chat connection.
+
+Builds N idle sessions that have each exchanged a few messages and reports
+bytes per connection (measured with tracemalloc) for:
+
+  - the previous representation, a list of {"role", "content"} dicts
+  - ChatSession with history held in the shared MessageStore
+  - ChatSession after the idle sweep has evicted stored conversations
+
+    python scripts/bench_sessions.py --connections 20000 --messages 6
+
+Message text is generated per message, as it would be when received from a
+socket or returned by Ollama.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.sessions import (  # noqa: E402
+    ASSISTANT,
+    USER,
+    ChatSession,
+    MessageStore,
+    SessionManager,
+)
+
+
+def make_text(i: int, j: int, length: int) -> str:
+    return (f"connection {i} message {j} " * (length // 20 + 1))[:length]
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def build_dicts(connections: int, messages: int, length: int):
+    clients = {}
+    for i in range(connections):
+        history = []
+        for j in range(messages):
+            role = "user" if j % 2 == 0 else "assistant"
+            history.append({"role": role, "content": make_text(i, j, length)})
+        clients[i] = history
+    return clients
+
+
+def build_sessions(connections: int, messages: int, length: int, evict: bool):
+    manager = SessionManager(MessageStore(connections * messages))
+    clients = {}
+    for i in range(connections):
+        session = ChatSession(user_id=i)
+        session.conversation_id = i
+        for j in range(messages):
+            role = USER if j % 2 == 0 else ASSISTANT
+            manager.append(session, role, make_text(i, j, length))
+        clients[i] = session
+    if evict:
+        manager.evict_idle(clients.values(), now=float("inf"))
+    return manager, clients
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=20000)
+    parser.add_argument("--messages", type=int, default=6)
+    parser.add_argument("--length", type=int, default=200, help="Characters per message.")
+    args = parser.parse_args()
+
+    n, m, length = args.connections, args.messages, args.length
+    results = [
+        ("list of dicts", measure(lambda: build_dicts(n, m, length))),
+        ("ChatSession", measure(lambda: build_sessions(n, m, length, evict=False))),
+        ("ChatSession, evicted", measure(lambda: build_sessions(n, m, length, evict=True))),
+    ]
+
+    print(f"{n} idle connections, {m} messages of {length} chars each")
+    for name, total in results:
+        print(f"{name:24s} {total / n:10.0f} bytes/connection")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Bulk export and import of users and conversations as NDJSON.
+
+    python scripts/bulk.py export > dump.ndjson
+    python scripts/bulk.py import dump.ndjson --batch-size 5000
+
+Import records may carry a plain `password` instead of `password_hash`,
+which makes this usable for seeding load-test users as well.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import BULK_HASH_WORKERS  # noqa: E402
+from app.crud.bulk import BATCH_SIZE, export_ndjson, import_ndjson  # noqa: E402
+from app.database import DB  # noqa: E402
+
+
+def run_export(args) -> None:
+    output = open(args.output, "w") if args.output else sys.stdout
+    db = DB.SessionLocal()
+    try:
+        for chunk in export_ndjson(db, batch_size=args.batch_size):
+            output.write(chunk)
+    finally:
+        db.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_import(args) -> None:
+    source = open(args.input) if args.input != "-" else sys.stdin
+    db = DB.SessionLocal()
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for totals in import_ndjson(
+                db, source, batch_size=args.batch_size, executor=executor
+            ):
+                elapsed = time.perf_counter() - start
+                rows = totals["users"] + totals["conversations"] + totals["messages"]
+                print(
+                    f"\r{totals['users']} users, {totals['conversations']} conversations, "
+                    f"{totals['messages']} messages, {totals['skipped']} skipped "
+                    f"({rows / max(elapsed, 1e-9):.0f} rows/s)",
+                    end="",
+                    file=sys.stderr,
+                )
+        print(f"\nDone in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write all data as NDJSON.")
+    export_parser.add_argument("-o", "--output", help="File to write (default: stdout).")
+    export_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    export_parser.set_defaults(func=run_export)
+
+    import_parser = subparsers.add_parser("import", help="Load an NDJSON export.")
+    import_parser.add_argument("input", help="File to read, or - for stdin.")
+    import_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=BULK_HASH_WORKERS,
+        help="Threads used to hash plain-text passwords.",
+    )
+    import_parser.set_defaults(func=run_import)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    finally:
+        DB.disconnect()
+
+
+if __name__ == "__main__":
+    main()
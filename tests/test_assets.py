@@ -0,0 +1,117 @@
+import gzip
+
+import pytest  # type: ignore
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.assets import AssetCache
+from main import app as main_app
+
+PAGE = b"<html><body>" + b"<p>Hello, chat!</p>" * 200 + b"</body></html>"
+
+
+@pytest.fixture()
+def client(tmp_path):
+    """Client for an app serving a temporary static directory."""
+    (tmp_path / "index.html").write_bytes(PAGE)
+    assets = AssetCache(tmp_path)
+    assets.load()
+
+    app = FastAPI()
+
+    @app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+    def read_static(path: str, request: Request):
+        return assets.response(request, path, cache_control="public, max-age=60")
+
+    client = TestClient(app)
+    client.assets = assets
+    return client
+
+
+def test_serves_precompressed_gzip(client):
+    """Test that gzip clients get the precompressed variant"""
+    response = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == PAGE
+    assert int(response.headers["content-length"]) == len(gzip.compress(PAGE, mtime=0))
+
+
+def test_identity_when_not_accepted(client):
+    """Test that clients without compression support get the raw file"""
+    response = client.get(
+        "/static/index.html", headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+
+    assert response.headers["content-encoding"] == "identity"
+    assert response.content == PAGE
+
+
+def test_if_none_match_returns_304(client):
+    """Test revalidation with the strong ETag of the same representation"""
+    first = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    second = client.get(
+        "/static/index.html",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+    other = client.get("/static/index.html", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_missing_and_escaping_paths(client):
+    """Test that unknown files and paths outside the directory are not served"""
+    assert client.get("/static/missing.js").status_code == 404
+    assert client.get("/static/..%2F..%2Fetc%2Fpasswd").status_code == 404
+
+
+def test_changed_file_is_reloaded(client, tmp_path):
+    """Test that an edited file gets a new ETag"""
+    etag = client.get("/static/index.html").headers["etag"]
+    (tmp_path / "index.html").write_bytes(PAGE + b"<!-- edited -->")
+
+    response = client.get("/static/index.html")
+    assert response.headers["etag"] != etag
+    assert response.content.endswith(b"<!-- edited -->")
+
+
+def test_head_returns_headers_only(client):
+    """Test that HEAD gets the GET headers without a body"""
+    get = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+    head = client.head("/static/index.html", headers={"Accept-Encoding": "gzip"})
+
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["etag"] == get.headers["etag"]
+    assert head.headers["content-length"] == get.headers["content-length"]
+
+
+def test_path_spellings_share_one_entry(client):
+    """Test that other spellings of a path do not add cache entries"""
+    (client.assets.directory / "sub").mkdir()
+    for i in range(5):
+        response = client.get(f"/static/sub/..%2F.%2Fsub%2F..%2Findex.html?{i}")
+        assert response.content == PAGE
+    client.get("/static/./index.html")
+
+    assert list(client.assets._assets) == ["index.html"]
+
+
+def test_gzip_middleware_keeps_identity_variant():
+    """Test that the app's GZip middleware honours q=0 on the identity variant"""
+    client = TestClient(main_app)
+    identity = client.get("/", headers={"Accept-Encoding": "identity"})
+    response = client.get("/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert response.headers["content-encoding"] == "identity"
+    assert response.headers["etag"] == identity.headers["etag"]
+    assert int(response.headers["content-length"]) == len(response.content)
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import get_current_admin, get_password_hash, verify_password
+from app.crud.bulk import export_ndjson, import_ndjson
+from app.crud.conversation import add_message, create_conversation
+from app.database import Base, Database
+from app.models import Conversation, Message, User
+from app.routers.bulk import router as bulk_router
+
+load_dotenv()
+
+DB_URL = os.getenv("DATABASE_URL")
+DB = Database(DB_URL)
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Database fixture that sets up and tears down the database for testing."""
+    DB.connect()
+    Base.metadata.drop_all(bind=DB.engine)
+    Base.metadata.create_all(bind=DB.engine)
+    yield DB
+    Base.metadata.drop_all(bind=DB.engine)
+    DB.disconnect()
+
+
+@pytest.fixture(scope="function")
+def session(db):
+    """Creates a new database session for each test and empties the tables afterwards."""
+    SessionLocal = sessionmaker(bind=db.engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(User).delete()
+        session.commit()
+        session.close()
+
+
+def test_export_import_round_trip(session):
+    """Test that an export can be loaded back into an empty database"""
+    user = User(username="alice", email="alice@example.com", password=get_password_hash("pw"))
+    session.add(user)
+    session.commit()
+    conversation = create_conversation(session, user.id, title="Hello")
+    add_message(session, conversation, "user", "Hi there")
+    add_message(session, conversation, "assistant", "Hello! How can I help?")
+
+    dump = "".join(export_ndjson(session, batch_size=2))
+    session.query(User).delete()
+    session.commit()
+
+    progress = list(import_ndjson(session, dump.splitlines(), batch_size=1))
+
+    assert progress[-1] == {"users": 1, "conversations": 1, "messages": 2, "skipped": 0}
+    assert len(progress) == 4
+    imported = session.query(User).filter_by(username="alice").one()
+    assert verify_password("pw", imported.password)
+    messages = session.query(Message).order_by(Message.id).all()
+    assert [m.content for m in messages] == ["Hi there", "Hello! How can I help?"]
+    assert {m.user_id for m in messages} == {imported.id}
+    assert session.query(Conversation).one().title == "Hello"
+
+
+def test_import_twice_does_not_duplicate(session):
+    """Test that rerunning an import skips existing users and their history"""
+    user = User(username="bob", email="bob@example.com", password=get_password_hash("pw"))
+    session.add(user)
+    session.commit()
+    conversation = create_conversation(session, user.id, title="Hello")
+    add_message(session, conversation, "user", "Hi there")
+    dump = "".join(export_ndjson(session)).splitlines()
+    session.query(User).delete()
+    session.commit()
+
+    first = list(import_ndjson(session, dump))[-1]
+    second = list(import_ndjson(session, dump))[-1]
+
+    assert first == {"users": 1, "conversations": 1, "messages": 1, "skipped": 0}
+    assert second == {"users": 0, "conversations": 0, "messages": 0, "skipped": 3}
+    assert session.query(User).count() == 1
+    assert session.query(Conversation).count() == 1
+    assert session.query(Message).count() == 1
+
+
+def test_import_hashes_plain_passwords(session):
+    """Test that plain passwords are hashed on the worker pool and duplicates skipped"""
+    lines = [
+        '{"type": "user", "username": "u1", "email": "u1@example.com", "password": "one"}',
+        '{"type": "user", "username": "u2", "email": "u2@example.com", "password": "two"}',
+        '{"type": "user", "username": "u1", "email": "u1@example.com", "password": "one"}',
+    ]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        totals = list(import_ndjson(session, lines, executor=executor))[-1]
+
+    assert totals["users"] == 2
+    assert totals["skipped"] == 1
+    u2 = session.query(User).filter_by(username="u2").one()
+    assert verify_password("two", u2.password)
+
+
+def test_import_rejects_unknown_record(session):
+    """Test that an unknown record type stops the import"""
+    with pytest.raises(ValueError):
+        list(import_ndjson(session, ['{"type": "widget"}']))
+
+
+def test_admin_requires_flag(session):
+    """Test that bulk access comes from the is_admin flag, not the username"""
+    user = User(username="admin", email="admin@example.com", password="x")
+    session.add(user)
+    session.commit()
+    assert user.is_admin is False
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_admin(user))
+    assert exc.value.status_code == 403
+
+    user.is_admin = True
+    assert asyncio.run(get_current_admin(user)) is user
+
+
+def test_import_endpoint_reports_database_errors(session):
+    """Test that a record the database rejects ends the stream with an error line"""
+    app = FastAPI()
+    app.include_router(bulk_router, prefix="/api")
+    app.dependency_overrides[get_current_admin] = lambda: None
+    lines = [
+        '{"type": "user", "username": "u1", "email": "u1@example.com", "password_hash": "x"}',
+        '{"type": "conversation", "id": 1, "username": "u1", "title": "Hi"}',
+        '{"type": "message", "conversation_id": 1, "role": "' + "r" * 40 + '", "content": "hi"}',
+    ]
+    response = TestClient(app).post(
+        "/api/bulk/import", files={"file": ("dump.ndjson", "\n".join(lines))}
+    )
+
+    progress = [json.loads(line) for line in response.text.splitlines()]
+    assert progress[-2]["conversations"] == 1
+    assert progress[-1]["error"].startswith("Database error:")
+    assert session.query(Conversation).count() == 1
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+
+import pytest  # type: ignore
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.routers.chat as chat
+from app.drain import SERVICE_RESTART, ConnectionDrain
+from app.sessions import ASSISTANT, USER
+
+
+@pytest.fixture()
+def drain(monkeypatch):
+    """A fresh drain state with a slow fake Ollama reply."""
+
+    async def fake_chat(message, system_prompt=None, conversation_history=None):
+        await asyncio.sleep(0.3)
+        return f"echo: {message}"
+
+    monkeypatch.setattr(chat.ollama_service, "chat", fake_chat)
+    connection_drain = ConnectionDrain(base_ms=1000, jitter_ms=500)
+    monkeypatch.setattr(chat, "connection_drain", connection_drain)
+    return connection_drain
+
+
+@pytest.fixture()
+def client(drain):
+    """Client for an app serving only the chat router."""
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api")
+    with TestClient(app) as client:
+        yield client
+
+
+def start_drain(client, drain, timeout):
+    return client.portal.start_task_soon(drain.drain, chat.connected_clients, timeout)
+
+
+def assert_reconnect(ws):
+    frame = json.loads(ws.receive_text())
+    assert frame["type"] == "reconnect"
+    assert 1000 <= frame["retry_after_ms"] <= 1500
+    assert ws.receive()["code"] == SERVICE_RESTART
+
+
+def test_idle_socket_is_told_to_reconnect(client, drain):
+    """Test that idle sockets get a reconnect hint straight away"""
+    with client.websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        start_drain(client, drain, timeout=5).result()
+        assert_reconnect(ws)
+
+
+def test_in_flight_generation_finishes_first(client, drain):
+    """Test that a reply being generated is delivered before the reconnect frame"""
+    with client.websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        ws.send_text(json.dumps({"type": "message", "text": "hi"}))
+        time.sleep(0.1)
+        future = start_drain(client, drain, timeout=5)
+
+        assert json.loads(ws.receive_text())["text"] == "echo: hi"
+        assert_reconnect(ws)
+        future.result()
+
+
+def test_deadline_cuts_off_generation(client, drain):
+    """Test that sockets still generating at the deadline are closed anyway"""
+    with client.websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        ws.send_text(json.dumps({"type": "message", "text": "hi"}))
+        time.sleep(0.1)
+        start_drain(client, drain, timeout=0.05).result()
+        assert_reconnect(ws)
+
+
+def test_cut_off_reply_is_not_saved(client, drain, monkeypatch):
+    """Test that a reply the client never received is left out of the conversation"""
+    saved = []
+    monkeypatch.setattr(chat, "_authenticate", lambda token: 1)
+    monkeypatch.setattr(chat, "_start_conversation", lambda user_id, title: 5)
+    monkeypatch.setattr(chat, "_save_message", lambda session, role, text: saved.append(role))
+
+    with client.websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        ws.send_text(json.dumps({"type": "join", "token": "t"}))
+        ws.send_text(json.dumps({"type": "message", "text": "hi"}))
+        time.sleep(0.1)
+        start_drain(client, drain, timeout=0.05).result()
+        assert_reconnect(ws)
+        time.sleep(0.4)  # let the generation finish
+
+    assert saved == [USER]
+
+
+def test_reply_is_delivered_before_slow_save(client, drain, monkeypatch):
+    """Test that the drain waits while a signed-in reply is delivered and saved"""
+    saved = []
+
+    def slow_save(session, role, text):
+        time.sleep(0.3)
+        saved.append(role)
+
+    monkeypatch.setattr(chat, "_authenticate", lambda token: 1)
+    monkeypatch.setattr(chat, "_start_conversation", lambda user_id, title: 5)
+    monkeypatch.setattr(chat, "_save_message", slow_save)
+
+    with client.websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        ws.send_text(json.dumps({"type": "join", "token": "t"}))
+        ws.send_text(json.dumps({"type": "message", "text": "hi"}))
+        time.sleep(0.1)
+        future = start_drain(client, drain, timeout=5)
+
+        assert json.loads(ws.receive_text())["text"] == "echo: hi"
+        assert_reconnect(ws)
+        future.result()
+
+    assert saved == [USER, ASSISTANT]
+
+
+def test_new_socket_is_rejected_while_draining(client, drain):
+    """Test that sockets opened during a drain are sent away"""
+    drain.draining = True
+    with client.websocket_connect("/api/chat") as ws:
+        assert_reconnect(ws)
+    assert not chat.connected_clients
@@ -0,0 +1,107 @@
+import os
+
+import pytest  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import get_password_hash
+from app.crud.conversation import (
+    add_message,
+    create_conversation,
+    decode_cursor,
+    search_messages,
+)
+from app.database import Base, Database
+from app.models.user import User
+
+load_dotenv()
+
+DB_URL = os.getenv("DATABASE_URL")
+DB = Database(DB_URL)
+
+
+@pytest.fixture(scope="module")
+def db():
+    """Database fixture that sets up and tears down the database for testing."""
+    DB.connect()
+    Base.metadata.drop_all(bind=DB.engine)
+    Base.metadata.create_all(bind=DB.engine)
+    yield DB
+    Base.metadata.drop_all(bind=DB.engine)
+    DB.disconnect()
+
+
+@pytest.fixture(scope="module")
+def session(db):
+    """Creates a session shared by the search tests and closes it afterwards."""
+    SessionLocal = sessionmaker(bind=db.engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture(scope="module")
+def users(session):
+    """Two users with a conversation each, so results can be checked for isolation."""
+    alice = User(username="alice", email="alice@example.com", password=get_password_hash("pw"))
+    bob = User(username="bob", email="bob@example.com", password=get_password_hash("pw"))
+    session.add_all([alice, bob])
+    session.commit()
+
+    conversation = create_conversation(session, alice.id, title="Cooking")
+    for i in range(5):
+        add_message(session, conversation, "user", f"How long should I bake bread loaf {i}?")
+    add_message(session, conversation, "assistant", "Bake bread for thirty minutes, bake it well.")
+    add_message(session, conversation, "user", "What about pasta?")
+
+    other = create_conversation(session, bob.id)
+    add_message(session, other, "user", "I also bake bread")
+    return alice, bob
+
+
+def test_search_matches_stemmed_terms(session, users):
+    """Test that search uses the english config and only returns the user's rows"""
+    alice, _ = users
+    rows, next_cursor = search_messages(session, alice.id, "baking breads")
+
+    assert len(rows) == 6
+    assert next_cursor is None
+    assert all(message.user_id == alice.id for message, _ in rows)
+    # The assistant reply mentions "bake" twice, so it ranks first
+    assert rows[0][0].role == "assistant"
+
+
+def test_search_keyset_pagination(session, users):
+    """Test that following cursors visits every match exactly once"""
+    alice, _ = users
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = search_messages(session, alice.id, "bread", limit=2, cursor=cursor)
+        seen.extend(message.id for message, _ in rows)
+        if cursor is None:
+            break
+
+    assert len(seen) == 6
+    assert len(set(seen)) == 6
+
+
+def test_search_recent_order(session, users):
+    """Test that recent order returns newest matches first across pages"""
+    alice, _ = users
+    first, cursor = search_messages(session, alice.id, "bread", limit=3, order="recent")
+    second, _ = search_messages(
+        session, alice.id, "bread", limit=3, cursor=cursor, order="recent"
+    )
+    keys = [(m.created_at, m.id) for m, _ in first + second]
+
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_invalid_cursor():
+    """Test that a garbage cursor is rejected"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "rank")
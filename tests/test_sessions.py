@@ -0,0 +1,121 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.routers.chat as chat
+from app.sessions import ASSISTANT, USER, ChatSession, MessageStore, SessionManager
+
+
+def test_history_is_trimmed_to_limit():
+    """Test that old messages fall out of the history and the shared store"""
+    manager = SessionManager(MessageStore(100), history_limit=4)
+    session = ChatSession()
+    for i in range(6):
+        manager.append(session, USER, f"message {i}")
+
+    history = manager.history(session)
+    assert [m["content"] for m in history] == [f"message {i}" for i in range(2, 6)]
+    assert len(manager.store) == 4
+
+
+def test_roles_are_interned():
+    """Test that stored roles share one string object"""
+    store = MessageStore(10)
+    key = store.add("".join(["assi", "stant"]), "hi")
+    assert store.get(key)[0] is ASSISTANT
+
+
+def test_idle_stored_session_is_evicted_and_restored():
+    """Test that an idle stored conversation drops its history until reloaded"""
+    manager = SessionManager(MessageStore(100), idle_seconds=60)
+    session = ChatSession(user_id=1)
+    session.conversation_id = 7
+    manager.append(session, USER, "hello")
+    manager.append(session, ASSISTANT, "hi there")
+
+    assert manager.evict_idle([session], now=session.last_active + 30) == 0
+    assert manager.evict_idle([session], now=session.last_active + 60) == 1
+    assert session.history is None
+    assert len(manager.store) == 0
+    assert manager.history(session) is None
+
+    manager.restore(session, [(USER, "hello"), (ASSISTANT, "hi there")])
+    assert manager.history(session) == [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "hi there"},
+    ]
+
+
+def test_generating_session_is_not_evicted():
+    """Test that a slow reply neither gets evicted nor revives an evicted session"""
+    manager = SessionManager(MessageStore(100), idle_seconds=60)
+    session = ChatSession(user_id=1)
+    session.conversation_id = 7
+    for i in range(4):
+        manager.append(session, USER, f"message {i}")
+
+    session.generating = True
+    assert manager.evict_idle([session], now=session.last_active + 600) == 0
+    session.generating = False
+    assert manager.evict_idle([session], now=session.last_active + 600) == 1
+
+    manager.append(session, ASSISTANT, "answer")
+    assert session.history is None
+    assert manager.history(session) is None
+
+
+def test_anonymous_session_is_not_evicted():
+    """Test that sessions without a stored conversation keep their history"""
+    manager = SessionManager(MessageStore(100), idle_seconds=60)
+    session = ChatSession()
+    manager.append(session, USER, "hello")
+
+    assert manager.evict_idle([session], now=session.last_active + 600) == 0
+    assert manager.history(session) == [{"role": "user", "content": "hello"}]
+
+
+def test_store_bound_forces_reload():
+    """Test that entries dropped from a full store are reported as missing"""
+    manager = SessionManager(MessageStore(2))
+    stored = ChatSession(user_id=1)
+    stored.conversation_id = 1
+    anonymous = ChatSession()
+    manager.append(stored, USER, "first")
+    manager.append(anonymous, USER, "a")
+    manager.append(anonymous, USER, "b")
+
+    assert manager.history(stored) is None
+    assert [m["content"] for m in manager.history(anonymous)] == ["a", "b"]
+
+
+def test_join_frame_signs_in_and_resumes(monkeypatch):
+    """Test that the token and conversation in the join frame resume a stored chat"""
+    saved = []
+
+    async def fake_chat(message, system_prompt=None, conversation_history=None):
+        return f"echo: {message}"
+
+    monkeypatch.setattr(chat.ollama_service, "chat", fake_chat)
+    monkeypatch.setattr(chat, "_authenticate", lambda token: 7 if token == "good" else None)
+    monkeypatch.setattr(chat, "_owns_conversation", lambda user_id, conv_id: conv_id == 3)
+    monkeypatch.setattr(chat, "_load_history", lambda conv_id, limit: [(USER, "earlier")])
+    monkeypatch.setattr(
+        chat,
+        "_save_message",
+        lambda session, role, text: saved.append(
+            (session.user_id, session.conversation_id, role)
+        ),
+    )
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/api")
+
+    with TestClient(app).websocket_connect("/api/chat") as ws:
+        ws.receive_text()  # welcome
+        ws.send_text(json.dumps({"type": "join", "token": "good", "conversation_id": 3}))
+        ws.send_text(json.dumps({"type": "message", "text": "hi"}))
+        reply = json.loads(ws.receive_text())
+
+    assert reply["text"] == "echo: hi"
+    assert reply["conversation_id"] == 3
+    assert saved == [(7, 3, USER), (7, 3, ASSISTANT)]
@@ -0,0 +1,34 @@
+from app.database import Database
+from app.services.ollama import OllamaService
+from app.startup import IMPORT_TIME_LINE
+
+
+def test_engine_is_created_lazily():
+    """Test that constructing a Database does not build an engine"""
+    db = Database("sqlite://")
+    assert db._engine is None
+
+    assert db.engine is not None
+    assert db._engine is db.engine
+
+
+def test_connect_skips_create_all():
+    """Test that Alembic-managed startup leaves the engine untouched"""
+    db = Database("sqlite://", create_all=False)
+    db.connect()
+    assert db._engine is None
+
+    db.disconnect()
+
+
+def test_ollama_client_is_created_lazily():
+    """Test that the Ollama HTTP client is only built on first use"""
+    service = OllamaService()
+    assert service._client is None
+    assert service.client is service.client
+
+
+def test_import_time_line():
+    """Test parsing a nested line of -X importtime output"""
+    match = IMPORT_TIME_LINE.match("import time:       120 |       4521 |     app.database")
+    assert match.groups() == ("120", "4521", "     ", "app.database")